@@ -8,7 +8,12 @@ Run with:
     uvicorn app.main:app --reload --port 8000
 """
 
+import asyncio
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
@@ -18,9 +23,12 @@ load_dotenv()
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
 from app.services.plagiarism_service import check_plagiarism
+from app.services.serper_client import close_client
+from app.services import paraphrase_service, semantic_cache, similarity
 from app.services.paraphrase_service import paraphrase_text # NEW: Paraphrase service
 
 # ---------------------------------------------------------------------------
@@ -32,19 +40,56 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Worker processes for CPU-bound similarity scoring (bypasses the GIL so
+# concurrent requests score in parallel). Kept small by default: each worker
+# holds its own numpy/sklearn/vectorizer copy next to the model-heavy main
+# process, and os.cpu_count() reports the host's cores inside containers.
+SIMILARITY_WORKERS: int = int(os.getenv("SIMILARITY_WORKERS", str(min(2, os.cpu_count() or 1))))
+
+
+def _create_similarity_pool() -> ProcessPoolExecutor:
+    """Start the similarity worker pool; each worker warms up once on spawn."""
+    # "spawn" keeps workers from inheriting torch/HTTP client state via fork
+    return ProcessPoolExecutor(
+        max_workers=SIMILARITY_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=similarity.warmup,
+    )
+
 
 # ---------------------------------------------------------------------------
-# Lifespan — runs once on startup (e.g. pre-download NLTK data)
+# Lifespan — runs once on startup (e.g. load models, start workers)
+#            and once on shutdown
 # ---------------------------------------------------------------------------
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Pre-download NLTK tokenizer data at startup so first request is fast."""
-    import nltk
-    try:
-        nltk.data.find("tokenizers/punkt_tab")
-    except LookupError:
-        nltk.download("punkt_tab", quiet=True)
+    """Warm up models and worker processes at startup so first request is fast."""
+    # Load the models and run them once, off the event loop. A failure (e.g.
+    # the model hub is unreachable) must not stop the API from starting —
+    # the models are loaded lazily again on first use.
+    for name, warmup in (
+        ("semantic cache", semantic_cache.warmup),
+        ("paraphrase model", paraphrase_service.warmup),
+    ):
+        try:
+            await asyncio.to_thread(warmup)
+        except Exception:
+            logger.exception("Failed to warm up %s; continuing without it.", name)
+
+    app.state.pool = _create_similarity_pool()
+    # Workers are spawned lazily on submit — start them all now with a no-op
+    # task so the first requests don't wait for process startup (the pool
+    # initializer does the actual warmup)
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(
+        loop.run_in_executor(app.state.pool, os.getpid)
+        for _ in range(SIMILARITY_WORKERS)
+    ))
+
     yield  # application runs here
+    app.state.pool.shutdown()
+    await close_client()
+    semantic_cache.save()
 
 
 # ---------------------------------------------------------------------------
@@ -55,6 +100,7 @@ app = FastAPI(
     description="Detects plagiarism by comparing text against web sources using TF-IDF cosine similarity.",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # ---------------------------------------------------------------------------
@@ -127,8 +173,28 @@ async def check_plagiarism_endpoint(request: PlagiarismRequest):
     """
     try:
         logger.info("Received plagiarism check request (%d chars).", len(request.text))
-        result = check_plagiarism(request.text, api_key=request.serper_api_key)
-        return result
+        pool = app.state.pool
+        try:
+            result = await check_plagiarism(
+                request.text,
+                api_key=request.serper_api_key,
+                executor=pool,
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed) and took the pool with it —
+            # replace the pool once and retry; search results are cached
+            logger.warning("Similarity worker pool is broken; recreating it.")
+            if app.state.pool is pool:
+                app.state.pool = _create_similarity_pool()
+                pool.shutdown(wait=False)
+            result = await check_plagiarism(
+                request.text,
+                api_key=request.serper_api_key,
+                executor=app.state.pool,
+            )
+        # The service already returns the PlagiarismResponse shape, so skip
+        # response_model revalidation and serialize it directly
+        return ORJSONResponse(content=result)
 
     except Exception as exc:
         logger.exception("Unexpected error during plagiarism check.")
@@ -150,7 +216,11 @@ async def paraphrase_endpoint(request: ParaphraseRequest):
     """
     try:
         logger.info("Received paraphrase request (%d chars).", len(request.text))
-        results = paraphrase_text(request.text, num_sequences=request.num_sequences)
+        # Generation is CPU/GPU-bound — keep the event loop (and the searches
+        # of in-flight plagiarism checks) responsive while it runs
+        results = await asyncio.to_thread(
+            paraphrase_text, request.text, num_sequences=request.num_sequences
+        )
         return {
             "original_text": request.text,
             "paraphrased_texts": results
@@ -4,26 +4,37 @@ Plagiarism Service — Orchestration Layer
 Coordinates the full plagiarism-checking pipeline:
   1. Split input text into sentences
   2. Filter out sentences that are too short
-  3. For each sentence, query the web and compute similarity
+  3. Query the web for all sentences concurrently, then compute similarity
   4. Aggregate results into a structured response
 """
 
+import asyncio
 import logging
+from concurrent.futures import Executor
+
+import numpy as np
 
 from app.utils.text_processing import split_sentences, filter_short_sentences
 from app.services.serper_client import search_google
-from app.services.similarity import compute_similarity
+from app.services import semantic_cache
+from app.services.similarity import compute_similarity_batch
 
 logger = logging.getLogger(__name__)
 
+MAX_CONCURRENT_QUERIES: int = 5  # upper bound on in-flight web searches
+
 
-def check_plagiarism(text: str, api_key: str = None) -> dict:
+async def check_plagiarism(
+    text: str, api_key: str = None, executor: Executor | None = None
+) -> dict:
     """
     Run the complete plagiarism detection pipeline on the given text.
 
     Args:
-        text:    The full text to check for plagiarism.
-        api_key: Optional Serper API key to use.
+        text:     The full text to check for plagiarism.
+        api_key:  Optional Serper API key to use.
+        executor: Optional executor (e.g. a process pool) for the CPU-bound
+                  similarity step. Defaults to the event loop's thread pool.
 
     Returns:
         A dictionary with:
@@ -45,40 +56,77 @@ def check_plagiarism(text: str, api_key: str = None) -> dict:
             "sentences": [],
         }
 
-    # Step 3 — Process each sentence: search the web → compute similarity
-    results: list[dict] = []
-    overall_max: float = 0.0
-
-    for sentence in sentences:
-        logger.info("Checking sentence: %.60s...", sentence)
-
-        # Query Serper.dev for web snippets matching this sentence
-        # Pass api_key if provided; serper_client will handle fallback behavior
-        snippets = search_google(sentence, num_results=3, api_key=api_key)
-
-        # Compute TF-IDF cosine similarity against retrieved snippets
-        similarity, best_snippet = compute_similarity(sentence, snippets)
-
-        # Track the highest similarity found across all sentences
-        if similarity > overall_max:
-            overall_max = similarity
+    # Step 3 — Query the web for every sentence concurrently, bounded by a
+    #          semaphore so we never flood the search provider
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+
+    async def bounded_search(sentence: str) -> list[str]:
+        async with semaphore:
+            logger.info("Checking sentence: %.60s...", sentence)
+            # Pass api_key if provided; serper_client will handle fallback behavior
+            return await search_google(sentence, num_results=3, api_key=api_key)
+
+    # Repeated sentences (headings, list items) are processed once; their
+    # result is fanned back out to every position in Step 5. Sentences close
+    # to previously searched ones reuse their cached results.
+    unique_sentences = list(dict.fromkeys(sentences))
+    try:
+        embeddings, snippets_list = await asyncio.to_thread(
+            semantic_cache.lookup, unique_sentences
+        )
+    except Exception:
+        # The cache is an optimization — search everything if it's unavailable
+        logger.exception("Semantic cache lookup failed; searching all sentences.")
+        embeddings, snippets_list = None, [None] * len(unique_sentences)
+    misses = [i for i, hit in enumerate(snippets_list) if hit is None]
+    logger.info("Semantic cache: %d hits, %d misses.",
+                len(unique_sentences) - len(misses), len(misses))
+
+    searched = await asyncio.gather(*(bounded_search(unique_sentences[i]) for i in misses))
+    if embeddings is not None:
+        try:
+            await asyncio.to_thread(semantic_cache.add, embeddings[misses], searched)
+        except Exception:
+            logger.exception("Semantic cache update failed.")
+    for i, snippets in zip(misses, searched):
+        snippets_list[i] = snippets
+
+    # Step 4 — Compute similarity for all unique sentences in one
+    #          vectorization pass. This is CPU-bound, so run it off the event loop
+    loop = asyncio.get_running_loop()
+    similarities = await loop.run_in_executor(
+        executor, compute_similarity_batch, unique_sentences, snippets_list
+    )
+
+    # Per-sentence data is kept as parallel arrays (one slot per unique
+    # sentence); response dicts are only built once, in Step 5
+    scores = np.empty(len(unique_sentences), dtype=np.float64)
+    sources: list[str] = []
+
+    for i, (snippets, (similarity, best_snippet)) in enumerate(
+        zip(snippets_list, similarities)
+    ):
+        scores[i] = similarity
 
         # Build a meaningful source label from the best matching snippet
         if best_snippet and similarity > 10:
-            source_label = best_snippet[:120] + ("..." if len(best_snippet) > 120 else "")
+            sources.append(best_snippet[:120] + ("..." if len(best_snippet) > 120 else ""))
         elif snippets:
-            source_label = "Tidak ada sumber signifikan ditemukan"
+            sources.append("Tidak ada sumber signifikan ditemukan")
         else:
-            source_label = "Tidak ada hasil pencarian"
-
-        results.append({
-            "sentence": sentence,
-            "similarity": similarity,
-            "source": source_label,
-        })
+            sources.append("Tidak ada hasil pencarian")
 
-    # Step 4 — Return aggregated response
+    # Step 5 — Return aggregated response, one entry per original sentence.
+    #          The overall score is the highest similarity across all sentences
+    position = {sentence: i for i, sentence in enumerate(unique_sentences)}
     return {
-        "overall_similarity": overall_max,
-        "sentences": results,
+        "overall_similarity": float(scores.max()),
+        "sentences": [
+            {
+                "sentence": sentence,
+                "similarity": float(scores[position[sentence]]),
+                "source": sources[position[sentence]],
+            }
+            for sentence in sentences
+        ],
     }
@@ -0,0 +1,219 @@
+"""
+Semantic Search Cache
+=====================
+Reuses web search results for sentences that are near-duplicates of
+sentences searched before (paraphrases, boilerplate). Sentences are
+embedded with a small multilingual sentence-transformer model and matched
+against past queries in a FAISS inner-product index; a match above the
+threshold reuses the stored snippets instead of calling the search API.
+
+Entries expire after CACHE_TTL seconds (like the Serper result cache) and
+the index is capped at MAX_ENTRIES, oldest entries dropped first. Expired
+rows are dropped in batches rather than on every insert, since removing rows
+copies the whole index.
+"""
+
+import bisect
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+
+import faiss
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+logger = logging.getLogger(__name__)
+
+# Multilingual model — the input text is Indonesian
+MODEL_NAME = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+SIMILARITY_THRESHOLD: float = 0.86  # cosine similarity needed to reuse results
+CACHE_TTL: int = 86400              # seconds, same as the search result cache
+MAX_ENTRIES: int = 50_000           # keeps brute-force lookups fast
+PRUNE_BATCH: int = 1_000            # expired/excess rows tolerated between prunes
+CACHE_DIR: str = os.getenv("SEMANTIC_CACHE_DIR", "/tmp/semantic_cache")
+INDEX_PATH: str = os.path.join(CACHE_DIR, "index.faiss")
+ENTRIES_PATH: str = os.path.join(CACHE_DIR, "entries.json")
+LOCK_PATH: str = os.path.join(CACHE_DIR, ".lock")
+
+_model = None
+_index = None
+_snippets: list[list[str]] = []      # snippets for each row of the index
+_added_at: list[float] = []          # insertion time of each row (ascending)
+_unsaved: int = 0                    # trailing rows added since the last save
+_lock = threading.Lock()             # index is shared across worker threads
+
+
+def get_model():
+    """Lazily load the sentence embedding model."""
+    global _model
+    if _model is None:
+        logger.info("Loading embedding model: %s ...", MODEL_NAME)
+        _model = SentenceTransformer(MODEL_NAME)
+        logger.info("Embedding model loaded successfully.")
+    return _model
+
+
+def _file_lock(exclusive: bool):
+    """Open and flock the lock file shared by all processes using CACHE_DIR."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fh = open(LOCK_PATH, "a")
+    fcntl.flock(fh, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    return fh
+
+
+def _read_disk(dimension: int):
+    """
+    Read the saved cache as (vectors, snippets, added_at), or None when it is
+    missing or incompatible (e.g. written with a different embedding model).
+    Caller must hold the file lock.
+    """
+    if not (os.path.exists(INDEX_PATH) and os.path.exists(ENTRIES_PATH)):
+        return None
+    index = faiss.read_index(INDEX_PATH)
+    with open(ENTRIES_PATH, encoding="utf-8") as fh:
+        entries = json.load(fh)
+    if (
+        index.d != dimension
+        or not isinstance(entries, dict)
+        or len(entries.get("snippets", [])) != index.ntotal
+    ):
+        logger.warning("Ignoring incompatible semantic cache in %s.", CACHE_DIR)
+        return None
+    if index.ntotal:
+        vectors = index.reconstruct_n(0, index.ntotal)
+    else:
+        vectors = np.empty((0, dimension), dtype=np.float32)
+    return vectors, entries["snippets"], entries["added_at"]
+
+
+def _prune(force: bool = False) -> None:
+    """
+    Drop expired rows and the oldest rows beyond MAX_ENTRIES.
+
+    Unless forced, nothing is dropped until at least PRUNE_BATCH rows are due;
+    lookup() already ignores expired rows, so they are harmless until then.
+    """
+    global _unsaved
+    expired = bisect.bisect_left(_added_at, time.time() - CACHE_TTL)
+    drop = max(expired, _index.ntotal - MAX_ENTRIES)
+    if drop >= (1 if force else PRUNE_BATCH):
+        # Rows are in insertion order, so everything to drop is a prefix
+        _index.remove_ids(np.arange(drop, dtype=np.int64))
+        del _snippets[:drop]
+        del _added_at[:drop]
+        _unsaved = min(_unsaved, _index.ntotal)
+
+
+def _get_index():
+    """Lazily load the index from disk, or create an empty one."""
+    global _index, _snippets, _added_at
+    if _index is None:
+        dimension = get_model().get_sentence_embedding_dimension()
+        _index = faiss.IndexFlatIP(dimension)
+        with _file_lock(exclusive=False):
+            saved = _read_disk(dimension)
+        if saved is not None:
+            vectors, _snippets, _added_at = saved
+            _index.add(vectors)
+            _prune(force=True)
+            logger.info("Loaded semantic cache with %d entries.", _index.ntotal)
+    return _index
+
+
+def warmup() -> None:
+    """Load the embedding model and index ahead of the first request."""
+    lookup(["Ini kalimat percobaan untuk pemanasan."])
+
+
+def lookup(sentences: list[str]) -> tuple[np.ndarray, list[list[str] | None]]:
+    """
+    Find cached snippets for sentences similar to previously searched ones.
+
+    Args:
+        sentences:  Sentences about to be searched.
+
+    Returns:
+        A tuple of (embeddings, hits) where embeddings holds one normalized
+        float32 row per sentence (to pass to add()) and hits holds the cached
+        snippets for each sentence, or None when there is no close match.
+    """
+    embeddings = get_model().encode(
+        sentences, normalize_embeddings=True, convert_to_numpy=True
+    ).astype(np.float32)
+
+    with _lock:
+        index = _get_index()
+        if index.ntotal == 0:
+            return embeddings, [None] * len(sentences)
+
+        # Inner product of normalized vectors == cosine similarity
+        scores, ids = index.search(embeddings, 1)
+        oldest_fresh = time.time() - CACHE_TTL
+        hits = [
+            _snippets[i]
+            if score >= SIMILARITY_THRESHOLD and _added_at[i] >= oldest_fresh
+            else None
+            for score, i in zip(scores[:, 0], ids[:, 0])
+        ]
+    return embeddings, hits
+
+
+def add(embeddings: np.ndarray, snippets_list: list[list[str]]) -> None:
+    """Store freshly searched snippets; empty results are not cached."""
+    global _unsaved
+    keep = [i for i, snippets in enumerate(snippets_list) if snippets]
+    if not keep:
+        return
+    now = time.time()
+    with _lock:
+        _get_index().add(embeddings[keep])
+        _snippets.extend(snippets_list[i] for i in keep)
+        _added_at.extend([now] * len(keep))
+        _unsaved += len(keep)
+        _prune()
+
+
+def save() -> None:
+    """
+    Persist the cache to CACHE_DIR.
+
+    Several server processes may share CACHE_DIR, so the entries added by
+    this process are merged into whatever is on disk (under a file lock)
+    instead of overwriting it.
+    """
+    global _index, _snippets, _added_at, _unsaved
+    with _lock:
+        if _index is None or _unsaved == 0:
+            return
+
+        total = _index.ntotal
+        vectors = _index.reconstruct_n(total - _unsaved, _unsaved)
+        snippets = _snippets[total - _unsaved:]
+        added_at = _added_at[total - _unsaved:]
+
+        with _file_lock(exclusive=True):
+            saved = _read_disk(_index.d)
+            if saved is not None:
+                vectors = np.vstack([saved[0], vectors])
+                snippets = saved[1] + snippets
+                added_at = saved[2] + added_at
+
+            # Keep rows in insertion order so pruning can drop a prefix
+            order = np.argsort(added_at, kind="stable")
+            _index = faiss.IndexFlatIP(vectors.shape[1])
+            _index.add(np.ascontiguousarray(vectors[order]))
+            _snippets = [snippets[i] for i in order]
+            _added_at = [added_at[i] for i in order]
+            _unsaved = 0
+            _prune(force=True)
+
+            # Write to temporary files first so readers never see a torn file
+            faiss.write_index(_index, INDEX_PATH + ".tmp")
+            with open(ENTRIES_PATH + ".tmp", "w", encoding="utf-8") as fh:
+                json.dump({"snippets": _snippets, "added_at": _added_at}, fh)
+            os.replace(INDEX_PATH + ".tmp", INDEX_PATH)
+            os.replace(ENTRIES_PATH + ".tmp", ENTRIES_PATH)
+    logger.info("Saved semantic cache with %d entries.", _index.ntotal)
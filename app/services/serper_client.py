@@ -1,9 +1,15 @@
 import os
-import time
+import asyncio
+import functools
+import hashlib
 import logging
+from contextvars import ContextVar
 
-import requests
-from duckduckgo_search import DDGS  # NEW: DuckDuckGo Search client
+import diskcache
+import httpx
+import orjson
+from aiolimiter import AsyncLimiter
+from async_lru import alru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -12,14 +18,73 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 DEFAULT_SERPER_API_KEY: str = os.getenv("SERPER_API_KEY", "")
 SERPER_ENDPOINT: str = "https://google.serper.dev/search"
+SEARCH_COUNTRY: str = "id"          # Serper "gl" — localize results to Indonesia
+SEARCH_LANGUAGE: str = "id"         # Serper "hl" — Indonesian interface language
 REQUEST_TIMEOUT: int = 10          # seconds
-DELAY_BETWEEN_QUERIES: float = 1.0  # seconds – avoids Serper rate limits
+MAX_CONNECTIONS: int = 10           # pooled connections to the Serper endpoint
+KEEPALIVE_EXPIRY: float = 60.0      # seconds an idle connection is kept open
+# Queries per second allowed by your Serper plan; requests only wait when
+# this token bucket is empty instead of sleeping after every query
+SERPER_RATE_LIMIT: int = int(os.getenv("SERPER_QPS", "5"))
+# DuckDuckGo rate-limits aggressively and has no key to buy a higher quota
+DDG_RATE_LIMIT: int = int(os.getenv("DDG_QPS", "1"))
+
+# ---------------------------------------------------------------------------
+# Result cache — in-process LRU in front of a persistent on-disk cache, so
+# repeated sentences skip the network entirely
+# ---------------------------------------------------------------------------
+CACHE_DIR: str = os.getenv("SERPER_CACHE_DIR", "/tmp/serper")
+CACHE_TTL: int = 86400              # seconds
+MEMORY_CACHE_SIZE: int = 10_000     # entries
+
+# ---------------------------------------------------------------------------
+# Shared HTTP client and rate limiter — one keep-alive / HTTP/2 connection
+# pool is reused across all queries instead of a new handshake per request.
+# ---------------------------------------------------------------------------
+_client = httpx.AsyncClient(
+    http2=True,
+    timeout=REQUEST_TIMEOUT,
+    limits=httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    ),
+    headers={"Content-Type": "application/json"},
+)
+_limiter = AsyncLimiter(SERPER_RATE_LIMIT, 1.0)
+_ddg_limiter = AsyncLimiter(DDG_RATE_LIMIT, 1.0)
+_DEFAULT_HEADERS: dict[str, str] = {"X-API-KEY": DEFAULT_SERPER_API_KEY}
+_disk_cache = diskcache.Cache(CACHE_DIR)
+_ddgs_lock = asyncio.Lock()            # DDGS is shared but not documented thread-safe
+
+# API key for the search in progress. Passed beside the cached call rather
+# than as an argument, so user-supplied keys never become cache keys (results
+# don't depend on the key) and aren't retained in memory.
+_request_api_key: ContextVar[str | None] = ContextVar("serper_api_key", default=None)
+
+
+async def close_client() -> None:
+    """Close the shared HTTP clients and result cache (called on shutdown)."""
+    await _client.aclose()
+    _disk_cache.close()
+    async with _ddgs_lock:
+        if _get_ddgs.cache_info().currsize:
+            # Same cleanup as leaving a `with DDGS() as ddgs:` block
+            _get_ddgs().__exit__(None, None, None)
+            _get_ddgs.cache_clear()
 
 
-def search_google(query: str, num_results: int = 3, api_key: str = None) -> list[str]:
+def _cache_key(query: str, num_results: int) -> str:
+    """Stable on-disk cache key for a query, ignoring case and outer spaces."""
+    normalized = f"{num_results}:{query.lower().strip()}"
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+async def search_google(query: str, num_results: int = 3, api_key: str = None) -> list[str]:
     """
     Send a search query to Serper.dev and extract organic result snippets.
     Fallback to DuckDuckGo if Serper fails or returns no results.
+    Non-empty results are cached in memory and on disk for CACHE_TTL seconds.
 
     Args:
         query:        The search query string (typically a sentence).
@@ -30,6 +95,36 @@ def search_google(query: str, num_results: int = 3, api_key: str = None) -> list
         A list of snippet strings from organic search results.
         Returns an empty list if both Serper and DuckDuckGo fail or find no results.
     """
+    token = _request_api_key.set(api_key)
+    try:
+        snippets = await _cached_search(query, num_results)
+    finally:
+        _request_api_key.reset(token)
+    if not snippets:
+        # Don't pin failed or empty lookups in memory — retry them next time
+        _cached_search.cache_invalidate(query, num_results)
+    return list(snippets)
+
+
+@alru_cache(maxsize=MEMORY_CACHE_SIZE, ttl=CACHE_TTL)
+async def _cached_search(query: str, num_results: int) -> tuple[str, ...]:
+    """Look the query up in the disk cache, searching the web on a miss."""
+    key = _cache_key(query, num_results)
+    # diskcache is synchronous SQLite — keep it off the event loop
+    cached = await asyncio.to_thread(_disk_cache.get, key)
+    if cached is not None:
+        return tuple(orjson.loads(cached))
+
+    snippets = await _search_uncached(query, num_results, _request_api_key.get())
+    if snippets:
+        await asyncio.to_thread(
+            _disk_cache.set, key, orjson.dumps(snippets), expire=CACHE_TTL
+        )
+    return tuple(snippets)
+
+
+async def _search_uncached(query: str, num_results: int, api_key: str | None) -> list[str]:
+    """Query Serper.dev, falling back to DuckDuckGo (see search_google)."""
     # Determine API key to use: passed arg > env var > empty string
     current_api_key = api_key or DEFAULT_SERPER_API_KEY
 
@@ -39,23 +134,26 @@ def search_google(query: str, num_results: int = 3, api_key: str = None) -> list
     if current_api_key:
         try:
             # logger.info("Attempting Serper search for query: %.30s...", query)
-            headers = {
-                "X-API-KEY": current_api_key,
-                "Content-Type": "application/json",
-            }
-            payload = {
+            if current_api_key == DEFAULT_SERPER_API_KEY:
+                headers = _DEFAULT_HEADERS
+            else:
+                headers = {"X-API-KEY": current_api_key}
+            body = orjson.dumps({
                 "q": query,
                 "num": num_results,
-            }
-
-            response = requests.post(
-                SERPER_ENDPOINT,
-                json=payload,
-                headers=headers,
-                timeout=REQUEST_TIMEOUT,
-            )
+                "gl": SEARCH_COUNTRY,
+                "hl": SEARCH_LANGUAGE,
+            })
+
+            # Token-bucket limiter only waits when the per-second budget is spent
+            async with _limiter:
+                response = await _client.post(
+                    SERPER_ENDPOINT,
+                    content=body,
+                    headers=headers,
+                )
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             # Extract snippet text from each organic result
             snippets: list[str] = []
@@ -73,14 +171,11 @@ def search_google(query: str, num_results: int = 3, api_key: str = None) -> list
             # If Serper returns empty list (no results found), we proceed to fallback
             logger.warning("Serper returned no organic results. Falling back to DuckDuckGo.")
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.warning("Serper request timed out. Falling back to DuckDuckGo.")
-        except requests.exceptions.RequestException as exc:
+        except (httpx.HTTPError, orjson.JSONDecodeError) as exc:
             logger.error("Serper request failed: %s. Falling back to DuckDuckGo.", exc)
             # If 403 Forbidden (Quota limit reached/Invalid Key), definitely fallback
-        finally:
-            # Small delay to respect rate limits between consecutive queries
-            time.sleep(DELAY_BETWEEN_QUERIES)
     
     else:
         # No API key provided at all
@@ -90,23 +185,45 @@ def search_google(query: str, num_results: int = 3, api_key: str = None) -> list
     # -----------------------------------------------------------------------
     # FALLBACK STRATEGY: DuckDuckGo (No API Key Required)
     # -----------------------------------------------------------------------
+    # DDGS is synchronous, so run it in a worker thread to keep the loop free.
+    # Fallbacks queue on the lock here on the loop rather than inside pool
+    # threads, and its own limiter keeps them from tripping DDG's rate limit
+    async with _ddgs_lock, _ddg_limiter:
+        return await asyncio.to_thread(_search_duckduckgo, query, num_results)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_ddgs():
+    """
+    Create the shared DuckDuckGo client on first fallback.
+
+    duckduckgo_search (and its HTTP stack) is imported here rather than at
+    module level, so processes that never fall back don't pay its import
+    time and memory. Callers must hold _ddgs_lock while using it (the
+    lock is taken on the event loop, around the worker thread).
+    """
+    from duckduckgo_search import DDGS
+    return DDGS()
+
+
+def _search_duckduckgo(query: str, num_results: int) -> list[str]:
+    """Blocking DuckDuckGo search used as the fallback strategy; run under _ddgs_lock."""
     try:
         # logger.info("Attempting DuckDuckGo search for query: %.30s...", query)
-        with DDGS() as ddgs:
-            # DDGS().text() returns an iterator of results
-            ddg_results = list(ddgs.text(query, max_results=num_results))
-            
-            snippets: list[str] = []
-            for result in ddg_results:
-                snippet = result.get("body", "")  # DDG uses 'body' for snippet
-                if snippet:
-                    snippets.append(snippet)
-            
-            if snippets:
-                return snippets
-            
-            logger.warning("DuckDuckGo also returned no results for query: %.30s...", query)
-            return []
+        # DDGS().text() returns an iterator of results
+        ddg_results = list(_get_ddgs().text(query, max_results=num_results))
+        
+        snippets: list[str] = []
+        for result in ddg_results:
+            snippet = result.get("body", "")  # DDG uses 'body' for snippet
+            if snippet:
+                snippets.append(snippet)
+        
+        if snippets:
+            return snippets
+        
+        logger.warning("DuckDuckGo also returned no results for query: %.30s...", query)
+        return []
 
     except Exception as exc:
         logger.error("DuckDuckGo search failed: %s", exc)
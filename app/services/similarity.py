@@ -1,48 +1,141 @@
 """
 Similarity Computation Module
 ==============================
-Uses TF-IDF vectorization and cosine similarity to compare a sentence
-against a list of web snippets. Returns the highest similarity score
-found across all snippets.
+Vectorizes every sentence and web snippet of a request in a single pass
+and computes cosine similarity between each sentence and its own snippets.
+Returns the highest similarity score found for each sentence.
+
+TF-IDF weights come from a vectorizer fitted offline on a large background
+corpus (see scripts/build_idf.py); without one, a TF-IDF vectorizer is fitted
+on each request's own sentences and snippets.
 """
 
+import logging
+import os
+
+import joblib
+import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
+logger = logging.getLogger(__name__)
 
-def compute_similarity(sentence: str, snippets: list[str]) -> tuple[float, str]:
+# ---------------------------------------------------------------------------
+# Pretrained vectorizer — loaded once and only ever used in transform mode,
+# so a single instance is shared (and thread-safe) across all requests. Both
+# it and the per-request fallback produce L2-normalized rows.
+# ---------------------------------------------------------------------------
+IDF_VECTORIZER_PATH: str = os.getenv("IDF_VECTORIZER_PATH", "idf.pkl")
+_vectorizer = None
+_vectorizer_loaded = False
+
+
+def get_vectorizer():
+    """Lazily load the pretrained TF-IDF vectorizer, or None if there is none."""
+    global _vectorizer, _vectorizer_loaded
+    if not _vectorizer_loaded:
+        if os.path.exists(IDF_VECTORIZER_PATH):
+            _vectorizer = joblib.load(IDF_VECTORIZER_PATH)
+            logger.info("Loaded TF-IDF vectorizer from %s.", IDF_VECTORIZER_PATH)
+        else:
+            logger.warning("No IDF vectorizer at %s; fitting IDF per request.",
+                           IDF_VECTORIZER_PATH)
+        _vectorizer_loaded = True
+    return _vectorizer
+
+
+def _pair_scores(matrix, n_sentences: int, counts: np.ndarray) -> np.ndarray:
     """
-    Compute the TF-IDF cosine similarity between a sentence and each snippet.
+    Cosine similarity of every snippet row against the sentence it belongs to.
+
+    Rows are already L2-normalized by the vectorizer, so cosine similarity is
+    a plain row-wise dot product — no norms are recomputed and no sentence is
+    compared with another sentence's snippets. Work is proportional to the
+    number of non-zero terms, not to the vocabulary size.
+    """
+    owners = np.repeat(np.arange(n_sentences), counts)
+    queries = matrix[owners]
+    candidates = matrix[n_sentences:]
+    return np.asarray(queries.multiply(candidates).sum(axis=1)).ravel()
+
+
+def warmup() -> None:
+    """
+    Score one tiny batch so the vectorizer is loaded and scoring is
+    initialized before the first real request.
+    """
+    sentence = "Ini kalimat percobaan untuk pemanasan."
+    compute_similarity_batch([sentence], [[sentence]])
+
+
+def compute_similarity_batch(
+    sentences: list[str], snippets_per_sentence: list[list[str]]
+) -> list[tuple[float, str]]:
+    """
+    Compute the cosine similarity between each sentence and its own snippets.
 
     Args:
-        sentence:  The original user sentence.
-        snippets:  List of web search result snippets to compare against.
+        sentences:              The original user sentences.
+        snippets_per_sentence:  For each sentence, the web snippets to compare
+                                against (same order and length as sentences).
 
     Returns:
-        A tuple of (highest_similarity_percentage, best_matching_snippet).
-        Returns (0.0, "") if no snippets are provided or computation fails.
+        A list of (highest_similarity_percentage, best_matching_snippet)
+        tuples, one per sentence. A sentence without snippets gets (0.0, "").
     """
-    if not snippets:
-        return 0.0, ""
+    n_sentences = len(sentences)
 
-    try:
-        # Build a corpus: the user sentence + all retrieved snippets
-        corpus = [sentence] + snippets
+    # Flatten snippets into one corpus, remembering where each sentence's
+    # snippets start and end
+    flat_snippets: list[str] = []
+    offsets: list[int] = [0]
+    for snippets in snippets_per_sentence:
+        flat_snippets.extend(snippets)
+        offsets.append(len(flat_snippets))
+
+    if not flat_snippets:
+        return [(0.0, "")] * n_sentences
 
-        # Vectorize using TF-IDF — converts text to numerical feature vectors
-        vectorizer = TfidfVectorizer()
-        tfidf_matrix = vectorizer.fit_transform(corpus)
+    # Vectorize the whole corpus once
+    corpus = sentences + flat_snippets
+    vectorizer = get_vectorizer()
+    try:
+        if vectorizer is None:
+            # No background corpus — learn IDF from this request's texts
+            matrix = TfidfVectorizer().fit_transform(corpus)
+        else:
+            matrix = vectorizer.transform(corpus)
+    except ValueError:
+        # Can occur if all texts are empty or contain only stop-words
+        return [(0.0, "")] * n_sentences
+    scores = _pair_scores(matrix, n_sentences, np.diff(offsets))
 
-        # Compute cosine similarity between the sentence (index 0) and every snippet
-        similarities = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:])
+    results: list[tuple[float, str]] = []
+    for i in range(n_sentences):
+        start, end = offsets[i], offsets[i + 1]
+        if start == end:
+            results.append((0.0, ""))
+            continue
 
-        # Find the highest similarity score and its corresponding snippet
-        max_index = similarities[0].argmax()
-        max_score = float(similarities[0][max_index])
+        row = scores[start:end]
+        max_index = int(row.argmax())
+        max_score = float(row[max_index])
 
         # Convert to percentage (0–100) and round to 1 decimal place
-        return round(max_score * 100, 1), snippets[max_index]
+        results.append((round(max_score * 100, 1), flat_snippets[start + max_index]))
 
-    except ValueError:
-        # Can occur if all texts are empty or contain only stop-words
-        return 0.0, ""
+    return results
+
+
+def compute_similarity(sentence: str, snippets: list[str]) -> tuple[float, str]:
+    """
+    Compute the cosine similarity between a single sentence and each snippet.
+
+    Args:
+        sentence:  The original user sentence.
+        snippets:  List of web search result snippets to compare against.
+
+    Returns:
+        A tuple of (highest_similarity_percentage, best_matching_snippet).
+        Returns (0.0, "") if no snippets are provided.
+    """
+    return compute_similarity_batch([sentence], [snippets])[0]
@@ -1,32 +1,93 @@
 """
 Text Processing Utilities
 =========================
-Handles text splitting and filtering using NLTK sentence tokenizer.
+Handles text splitting and filtering using a compiled sentence-boundary regex.
 """
 
-import nltk
+import re
 
 # ---------------------------------------------------------------------------
-# Ensure the NLTK tokenizer model is downloaded on first use.
-# 'punkt_tab' is the updated tokenizer resource for sent_tokenize.
+# Sentence boundary: whitespace after terminal punctuation, optionally closed
+# by a quote or parenthesis. Compiled once at import.
+#   - After a full stop (not an ellipsis) any next character starts a new
+#     sentence; abbreviations are filtered out separately below.
+#   - After ! ? or … the next sentence must start with an uppercase letter,
+#     digit or opening quote, so dialogue tags ('"Kenapa?" tanya dia') stay
+#     attached to their quote.
 # ---------------------------------------------------------------------------
-try:
-    nltk.data.find("tokenizers/punkt_tab")
-except LookupError:
-    nltk.download("punkt_tab", quiet=True)
+_SENT_RE = re.compile(
+    r"(?:(?<=[^.]\.)|(?<=[^.]\.[\"'”’)]))\s+"
+    r"|(?:(?<=[!?…])|(?<=[!?…][\"'”’)]))\s+(?=[A-ZÀ-ÖØ-Þ0-9\"'“‘(])",
+    re.UNICODE,
+)
+
+# Common Indonesian (and a few English) abbreviations that end with a full
+# stop without ending the sentence, compared in lowercase without the dot.
+# Single-letter initials ("H. Agus Salim") are handled separately.
+_ABBREVIATIONS = frozenset({
+    # titles and forms of address
+    "dr", "drs", "dra", "prof", "ir", "hj", "kh", "st", "sdr", "sdri",
+    "bpk", "tn", "ny", "nn", "yth", "mr", "mrs", "ms",
+    "s.pd", "s.kom", "s.h", "s.e", "s.t", "s.si", "s.sos", "m.pd", "m.si",
+    "m.kom", "m.m", "m.t", "ph.d",
+    # addresses and places
+    "jl", "jln", "gg", "kel", "kec", "kab", "prov", "ds", "rt", "rw",
+    # money, numbers and references
+    "rp", "no", "hal", "hlm", "tgl", "th", "thn", "psl", "ayt",
+    # writing abbreviations
+    "dgn", "tsb", "sbb", "spt", "yg", "utk", "krn", "a.n", "u.p", "vs",
+    "dll", "dsb", "dst", "dkk",
+})
+
+# Abbreviations that often end a sentence ("…buku, pena, dll. Harga…"):
+# followed by an uppercase word, they are treated as a sentence boundary.
+_SENTENCE_FINAL_ABBREVIATIONS = frozenset({"dll", "dsb", "dst", "dkk"})
+
+
+def _is_abbreviation_stop(text: str, next_char: str) -> bool:
+    """Whether the full stop ending text belongs to an abbreviation or initial."""
+    last = text.rsplit(None, 1)[-1]
+    if not last.endswith("."):
+        return False
+    word = last[:-1].lstrip("\"'“‘(").lower()
+    if word in _SENTENCE_FINAL_ABBREVIATIONS:
+        return not next_char.isupper()
+    return word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha())
 
 
 def split_sentences(text: str) -> list[str]:
     """
-    Split a block of text into individual sentences using NLTK.
+    Split a block of text into individual sentences.
 
     Args:
         text: The raw input text.
 
     Returns:
-        A list of sentence strings.
+        A list of non-empty sentence strings.
+
+    Examples:
+        >>> split_sentences("Harga beras Rp. 12.000 per kilo. Jln. Merdeka ramai.")
+        ['Harga beras Rp. 12.000 per kilo.', 'Jln. Merdeka ramai.']
+        >>> split_sentences("Dibuka Dr. Budi dan H. Agus. acara lalu dimulai.")
+        ['Dibuka Dr. Budi dan H. Agus.', 'acara lalu dimulai.']
+        >>> split_sentences("Ada buku, pena, dll. Harganya murah sekali.")
+        ['Ada buku, pena, dll.', 'Harganya murah sekali.']
+        >>> split_sentences("Ada buku, pena, dll. yang dijual murah.")
+        ['Ada buku, pena, dll. yang dijual murah.']
+        >>> split_sentences('"Kenapa?" tanya dia. "Entahlah!" Lalu hening.')
+        ['"Kenapa?" tanya dia.', '"Entahlah!"', 'Lalu hening.']
     """
-    return nltk.sent_tokenize(text)
+    text = text.strip()
+    sentences: list[str] = []
+    start = 0
+    for match in _SENT_RE.finditer(text):
+        candidate = text[start:match.start()]
+        if _is_abbreviation_stop(candidate, text[match.end():match.end() + 1]):
+            continue  # "Dr. Budi" — not a sentence boundary
+        sentences.append(candidate)
+        start = match.end()
+    sentences.append(text[start:])
+    return [s for s in sentences if s]
 
 
 def filter_short_sentences(sentences: list[str], min_words: int = 5) -> list[str]:
@@ -40,4 +101,7 @@ def filter_short_sentences(sentences: list[str], min_words: int = 5) -> list[str
     Returns:
         Filtered list containing only sentences with >= min_words words.
     """
-    return [s for s in sentences if len(s.split()) >= min_words]
+    # Stop splitting once min_words words are found — long sentences no longer
+    # allocate a full word list just to be counted
+    max_split = min_words - 1
+    return [s for s in sentences if len(s.split(None, max_split)) >= min_words]
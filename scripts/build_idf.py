@@ -0,0 +1,34 @@
+"""
+Build IDF Vectorizer
+====================
+Offline script that fits a TF-IDF vectorizer on a large background corpus
+(e.g. an Indonesian Wikipedia dump converted to plain text, one document
+per line) and saves it for the similarity module to load at startup.
+
+Run with:
+    python scripts/build_idf.py corpus.txt idf.pkl
+"""
+
+import argparse
+
+import joblib
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("corpus", help="Plain-text corpus, one document per line.")
+    parser.add_argument("output", nargs="?", default="idf.pkl", help="Output path (default idf.pkl).")
+    parser.add_argument("--max-features", type=int, default=200_000, help="Vocabulary size.")
+    args = parser.parse_args()
+
+    vectorizer = TfidfVectorizer(max_features=args.max_features)
+    with open(args.corpus, encoding="utf-8") as fh:
+        vectorizer.fit(line for line in fh if line.strip())
+
+    joblib.dump(vectorizer, args.output)
+    print(f"Saved vectorizer with {len(vectorizer.vocabulary_)} terms to {args.output}")
+
+
+if __name__ == "__main__":
+    main()